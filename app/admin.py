@@ -5,6 +5,6 @@ from app.models import PointOfInterest
 
 @admin.register(PointOfInterest)
 class PointOfInterestAdmin(admin.ModelAdmin):
-    list_display = ["id", "external_id", "name", "category", "average_rating"]
-    list_filter = ["category"]
+    list_display = ["id", "external_id", "name", "category", "source", "average_rating"]
+    list_filter = ["category", "source"]
     search_fields = ["=id", "=external_id"]
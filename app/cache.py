@@ -0,0 +1,136 @@
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from app.models import DataGeneration
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded in-process cache, evicting the least recently used entry once
+    `max_entries` is reached. Entries expire `ttl` seconds after being set.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.size_bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, size, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        # Size of the pickled value, as an estimate of the memory it holds
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self.size_bytes += size
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size_bytes -= size
+
+
+class QueryCache:
+    """
+    Read-through cache for query results. Keys are built from the query name,
+    its normalised parameters and the current data generation, so results
+    cached before an import are never returned after it.
+
+    Uses an in-process LRUCache, or the Django cache named by `alias`
+    (e.g. a file based cache shared between processes).
+    """
+
+    def __init__(self, max_entries: int, ttl: float, alias: Optional[str] = None) -> None:
+        self.ttl = ttl
+        self.alias = alias
+        self.local = LRUCache(max_entries=max_entries, ttl=ttl) if alias is None else None
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get_or_set(self, name: str, params: dict, query: Callable[[], Any]) -> Any:
+        key = self.make_key(name=name, params=params, generation=DataGeneration.current())
+        value = self._get(key)
+        if value is not _MISSING:
+            with self._stats_lock:
+                self.hits += 1
+            return value
+
+        with self._stats_lock:
+            self.misses += 1
+        value = query()
+        self._set(key, value)
+        return value
+
+    @staticmethod
+    def make_key(name: str, params: dict, generation: int) -> str:
+        return f"poi:{generation}:{name}:{json.dumps(params, sort_keys=True)}"
+
+    def clear(self) -> None:
+        if self.local is not None:
+            self.local.clear()
+        else:
+            caches[self.alias].clear()
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "backend": self.alias or "local",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+            "entries": len(self.local) if self.local is not None else None,
+            "size_bytes": self.local.size_bytes if self.local is not None else None,
+        }
+
+    def _get(self, key: str) -> Any:
+        if self.local is not None:
+            return self.local.get(key, _MISSING)
+        return caches[self.alias].get(key, _MISSING)
+
+    def _set(self, key: str, value: Any) -> None:
+        if self.local is not None:
+            self.local.set(key, value)
+        else:
+            caches[self.alias].set(key, value, timeout=self.ttl)
+
+
+poi_query_cache = QueryCache(
+    max_entries=settings.POI_QUERY_CACHE["MAX_ENTRIES"],
+    ttl=settings.POI_QUERY_CACHE["TTL"],
+    alias=settings.POI_QUERY_CACHE["ALIAS"],
+)
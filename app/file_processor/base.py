@@ -1,11 +1,16 @@
 from abc import ABC, abstractclassmethod
+from typing import BinaryIO
 from typing import Iterator
 from pathlib import Path
 
 
 class FileProcessor(ABC):
-    @abstractclassmethod
     def read_file_content(self, file_path: Path) -> Iterator[dict]:
+        with file_path.open("rb") as stream:
+            yield from self.read_stream(stream=stream)
+
+    @abstractclassmethod
+    def read_stream(self, stream: BinaryIO) -> Iterator[dict]:
         pass
 
     @abstractclassmethod
@@ -0,0 +1,144 @@
+import hashlib
+import math
+import threading
+from typing import List
+from typing import Optional
+
+from django.db import connection
+from django.db.models import QuerySet
+
+from app.models import PointOfInterest
+
+SEED_CHUNK_SIZE = 20000
+# Smallest first filter of a ScalableBloomFilter, grown as IDs are added
+MIN_INITIAL_CAPACITY = 1_000_000
+
+
+class BloomFilter:
+    """
+    Compact set membership test. `in` may return false positives at roughly
+    `error_rate` while `capacity` values or fewer were added, but never false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.capacity = capacity
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, value: str) -> None:
+        self.count += 1
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, value: str) -> List[int]:
+        # Double hashing, deriving all positions from one 128 bit digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows with the number of values added, so the false
+    positive rate stays near `error_rate` however many values that is.
+
+    Once the current filter holds `capacity` values, a new filter twice the
+    size, with half the error rate, is added. Lookups check every filter.
+    """
+
+    def __init__(self, initial_capacity: int, error_rate: float = 0.01) -> None:
+        self.error_rate = error_rate
+        # The error rates halve with every filter, so their sum stays under error_rate
+        self.filters = [BloomFilter(capacity=initial_capacity, error_rate=error_rate / 2)]
+
+    def add(self, value: str) -> None:
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(capacity=current.capacity * 2, error_rate=self.error_rate / 2 ** (len(self.filters) + 1))
+            self.filters.append(current)
+        current.add(value)
+
+    def __contains__(self, value: str) -> bool:
+        return any(value in bloom for bloom in self.filters)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(bloom.size_bytes for bloom in self.filters)
+
+
+class DuplicateExternalIdFilter:
+    """
+    Drops records whose external_id was already imported, or already seen in
+    the import, keeping the first occurrence.
+
+    IDs are tracked in a scalable Bloom filter seeded from `queryset` with one
+    streaming query, so memory stays at a few bytes per ID however many exist. IDs the filter may
+    have seen are confirmed with one query per batch against `queryset` and
+    `loaded_queryset` (rows loaded by this import outside `queryset`), so false
+    positives never drop a record.
+    """
+
+    def __init__(self, queryset: QuerySet, loaded_queryset: Optional[QuerySet] = None, error_rate: float = 0.01) -> None:
+        self.queryset = queryset
+        self.loaded_queryset = loaded_queryset
+        # Held while filtering and inserting a batch, when shared between threads
+        self.lock = threading.Lock()
+        self.bloom = ScalableBloomFilter(
+            initial_capacity=max(self._estimated_rows(), MIN_INITIAL_CAPACITY),
+            error_rate=error_rate,
+        )
+        for external_id in queryset.values_list("external_id", flat=True).iterator(chunk_size=SEED_CHUNK_SIZE):
+            self.bloom.add(external_id)
+
+    @staticmethod
+    def _estimated_rows() -> int:
+        """
+        Row count estimate from the planner statistics, summed over partitions,
+        rather than counting the table on top of the seeding query.
+        """
+        if connection.vendor != "postgresql":
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT COALESCE(SUM(GREATEST(reltuples, 0)), 0)::bigint FROM pg_class
+                WHERE oid = to_regclass(%s)
+                OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s))
+                """,
+                [PointOfInterest._meta.db_table] * 2,
+            )
+            return cursor.fetchone()[0]
+
+    def filter_batch(self, batch: List[PointOfInterest]) -> List[PointOfInterest]:
+        unique = {}
+        candidates = set()
+        for poi in batch:
+            external_id = str(poi.external_id)
+            if external_id in unique:
+                continue
+            unique[external_id] = poi
+            if external_id in self.bloom:
+                candidates.add(external_id)
+
+        if candidates:
+            for queryset in (self.queryset, self.loaded_queryset):
+                if queryset is None:
+                    continue
+                existing = queryset.filter(external_id__in=candidates).values_list("external_id", flat=True)
+                for external_id in existing:
+                    unique.pop(external_id, None)
+
+        for external_id in unique:
+            self.bloom.add(external_id)
+        return list(unique.values())
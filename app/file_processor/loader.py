@@ -0,0 +1,87 @@
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Type
+
+from django.contrib.gis.geos import Point
+from django.db import models
+
+from app.models import PointOfInterest
+from app.file_processor.base import FileProcessor
+from app.file_processor.dedup import DuplicateExternalIdFilter
+
+
+class PointOfInterestLoader:
+    """
+    Converts raw rows from a FileProcessor into PointOfInterest records
+    and inserts them into the database table in batches.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        source: str = "",
+        model: Type[models.Model] = PointOfInterest,
+        duplicate_filter: Optional[DuplicateExternalIdFilter] = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.source = source
+        # PointOfInterest, or a model for a partition being loaded (see app.partitions)
+        self.model = model
+        self.duplicate_filter = duplicate_filter
+        self.duplicates_removed = 0
+
+    def load(
+        self,
+        file_processor: FileProcessor,
+        rows: Iterable[dict],
+        on_batch: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Returns:
+            The number of records inserted.
+        """
+        batch = []
+        total_imported = 0
+
+        for row in rows:
+            row_dict = file_processor.row_to_dict(row=row)
+            batch.append(self._build_point_of_interest(row_dict=row_dict))
+            if len(batch) >= self.batch_size:
+                total_imported += self._flush(batch=batch, on_batch=on_batch)
+
+        # Insert any remaining records in the last batch
+        if batch:
+            total_imported += self._flush(batch=batch, on_batch=on_batch)
+        return total_imported
+
+    def _flush(self, batch: List[PointOfInterest], on_batch: Optional[Callable[[int], None]]) -> int:
+        if self.duplicate_filter is None:
+            self._bulk_insert(batch=batch)
+            inserted = len(batch)
+        else:
+            with self.duplicate_filter.lock:
+                unique = self.duplicate_filter.filter_batch(batch=batch)
+                self._bulk_insert(batch=unique)
+            inserted = len(unique)
+            self.duplicates_removed += len(batch) - inserted
+        batch.clear()
+        if on_batch is not None:
+            on_batch(inserted)
+        return inserted
+
+    def _build_point_of_interest(self, row_dict: dict) -> PointOfInterest:
+        return self.model(
+            external_id=row_dict.get("external_id"),
+            name=row_dict.get("name"),
+            description=row_dict.get("description", ""),
+            category=row_dict.get("category"),
+            point=Point(float(row_dict.get("latitude")), float(row_dict.get("longitude"))),
+            average_rating=row_dict.get("average_rating"),
+            ratings=row_dict.get("ratings"),
+            source=self.source,
+        )
+
+    def _bulk_insert(self, batch: List[PointOfInterest]) -> None:
+        self.model.objects.bulk_create(batch, ignore_conflicts=True)
@@ -1,18 +1,26 @@
 import csv
+import io
 import json
+import re
+from typing import BinaryIO
 from typing import Iterator
-from pathlib import Path
 
 import lxml.etree as etree
 
 from app.file_processor.base import FileProcessor
 
+WHITESPACE = re.compile(r"\s*")
+
 
 class CSVFileProcessor(FileProcessor):
-    def read_file_content(self, file_path: Path) -> Iterator[dict]:
-        with file_path.open("r", encoding="utf-8") as csv_file:
+    def read_stream(self, stream: BinaryIO) -> Iterator[dict]:
+        csv_file = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
             reader = csv.DictReader(csv_file)
             yield from reader
+        finally:
+            # Leave closing the underlying stream to its owner
+            csv_file.detach()
 
     def row_to_dict(self, row: dict) -> dict:
         ratings = row.get("poi_ratings").strip("{}").split(",")
@@ -30,10 +38,55 @@ class CSVFileProcessor(FileProcessor):
 
 
 class JSONFileProcessor(FileProcessor):
-    def read_file_content(self, file_path: Path) -> Iterator[dict]:
-        with file_path.open("r", encoding="utf-8") as json_file:
-            data = json.load(json_file)
-            yield from data
+    read_size = 65536
+
+    def read_stream(self, stream: BinaryIO) -> Iterator[dict]:
+        """
+        Decodes the items of the top level JSON array one at a time,
+        so the whole file is never loaded into memory.
+        """
+        json_file = io.TextIOWrapper(stream, encoding="utf-8")
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = 0
+        eof = False
+        in_array = False
+        try:
+            while True:
+                pos = WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer):
+                    char = buffer[pos]
+                    if not in_array:
+                        if char != "[":
+                            raise ValueError("Expected a JSON array of records")
+                        in_array = True
+                        pos += 1
+                        continue
+                    if char == ",":
+                        pos += 1
+                        continue
+                    if char == "]":
+                        return
+                    try:
+                        item, end = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        # Item not complete yet, unless there is nothing left to read
+                        if eof:
+                            raise
+                    else:
+                        if end < len(buffer) or eof:
+                            yield item
+                            pos = end
+                            continue
+                if eof:
+                    raise ValueError("Unexpected end of JSON data")
+                chunk = json_file.read(self.read_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+        finally:
+            # Leave closing the underlying stream to its owner
+            json_file.detach()
 
     def row_to_dict(self, row: dict) -> dict:
         ratings = row.get("ratings")
@@ -51,8 +104,8 @@ class JSONFileProcessor(FileProcessor):
 
 
 class XMLFileProcessor(FileProcessor):
-    def read_file_content(self, file_path: Path) -> Iterator[dict]:
-        for _, elem in etree.iterparse(file_path, events=["end"], recover=True):
+    def read_stream(self, stream: BinaryIO) -> Iterator[dict]:
+        for _, elem in etree.iterparse(stream, events=["end"], recover=True):
             if elem.tag == "DATA_RECORD":
                 row = {
                     child.tag: child.text.strip() if child.text else None
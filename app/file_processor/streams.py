@@ -0,0 +1,74 @@
+import io
+import queue
+from typing import Optional
+
+
+class ChunkStream(io.RawIOBase):
+    """
+    Read-only byte stream fed with chunks from another thread.
+
+    The writer puts chunks as they arrive and calls `finish()` at the end of
+    the data; `readinto()` blocks until a chunk is available. The queue is
+    bounded, so a slow reader applies back-pressure on the writer instead of
+    the whole body being held in memory.
+    """
+
+    def __init__(self, max_chunks: int = 16) -> None:
+        super().__init__()
+        self._chunks: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self._current = memoryview(b"")
+        self._eof = False
+        self._aborted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._current and not self._eof:
+            try:
+                chunk: Optional[bytes] = self._chunks.get(timeout=1)
+            except queue.Empty:
+                if self._aborted:
+                    raise IOError("Stream aborted before the end of the data")
+                continue
+            if chunk is None:
+                self._eof = True
+            else:
+                self._current = memoryview(chunk)
+        size = min(len(buffer), len(self._current))
+        buffer[:size] = self._current[:size]
+        self._current = self._current[size:]
+        return size
+
+    def try_put(self, chunk: bytes) -> bool:
+        """
+        Adds a chunk without blocking. Returns False if the queue is full.
+        """
+        if self._aborted:
+            return True
+        try:
+            self._chunks.put_nowait(chunk)
+        except queue.Full:
+            return False
+        return True
+
+    def put(self, chunk: bytes) -> None:
+        """
+        Adds a chunk, blocking while the queue is full unless the reader has gone away.
+        """
+        while not self._aborted:
+            try:
+                self._chunks.put(chunk, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def finish(self) -> None:
+        self.put(None)
+
+    def abort(self) -> None:
+        """
+        Stops the stream from either side, so neither the writer nor the reader
+        keeps waiting on the other.
+        """
+        self._aborted = True
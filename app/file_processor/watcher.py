@@ -0,0 +1,78 @@
+import os
+import time
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+from pathlib import Path
+
+
+class DirectoryWatcher:
+    """
+    Polls directories for data files, keeping a stat cache of (size, mtime)
+    per file so unchanged files are never reported twice.
+
+    A file is reported as ready once its stat is unchanged between two polls,
+    or straight away if it was last modified more than `settle_seconds` ago
+    (e.g. a complete file renamed into place).
+
+    This is a heuristic: a writer that pauses for longer than `settle_seconds`
+    gets its file reported half-written. Writers should write to a temporary
+    name (or another directory) and rename the file into place once complete.
+    """
+
+    def __init__(self, directories: List[Path], suffixes: Set[str], settle_seconds: float) -> None:
+        self.directories = directories
+        self.suffixes = suffixes
+        self.settle_seconds = settle_seconds
+        self._reported: Dict[Path, Tuple[int, int]] = {}
+        self._pending: Dict[Path, Tuple[int, int]] = {}
+
+    def poll(self) -> List[Path]:
+        """
+        Returns:
+            A list of Path objects for new or changed files that are complete.
+        """
+        ready = []
+        seen = set()
+        now_ns = time.time_ns()
+        settle_ns = int(self.settle_seconds * 1_000_000_000)
+
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                # Directory removed or unreadable, try again on the next poll
+                continue
+            for entry in entries:
+                try:
+                    if not entry.is_file() or Path(entry.name).suffix.lower() not in self.suffixes:
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # File removed or renamed since the directory was listed
+                    continue
+                path = Path(entry.path)
+                seen.add(path)
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if self._reported.get(path) == signature:
+                    continue
+                settled = now_ns - stat.st_mtime_ns >= settle_ns
+                if settled or self._pending.get(path) == signature:
+                    self._pending.pop(path, None)
+                    self._reported[path] = signature
+                    ready.append(path)
+                else:
+                    self._pending[path] = signature
+
+        # Forget files that were removed or renamed away
+        for cache in (self._reported, self._pending):
+            for path in set(cache) - seen:
+                del cache[path]
+        return ready
+
+    def forget(self, path: Path) -> None:
+        """
+        Reports the file again on the next poll, e.g. when it could not be imported yet.
+        """
+        self._reported.pop(path, None)
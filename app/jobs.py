@@ -0,0 +1,79 @@
+import threading
+import time
+import uuid
+from typing import Dict
+from typing import Optional
+
+
+class ImportJob:
+    """
+    Progress of a background import. Jobs are kept in memory, so status is
+    only available from the process that accepted the upload.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+    def __init__(self, file_format: str) -> None:
+        self.id = str(uuid.uuid4())
+        self.file_format = file_format
+        self.status = self.PENDING
+        self.file_hash: Optional[str] = None
+        self.rows_processed = 0
+        self.bytes_received = 0
+        self.error: Optional[str] = None
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.rows_processed / elapsed if elapsed > 0 else 0.0
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = time.monotonic()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "format": self.file_format,
+            "status": self.status,
+            "file_hash": self.file_hash,
+            "rows_processed": self.rows_processed,
+            "rows_per_second": round(self.rows_per_second, 2),
+            "bytes_received": self.bytes_received,
+            "error": self.error,
+        }
+
+
+# Finished jobs are kept this long for their status to be read
+FINISHED_JOB_RETENTION_SECONDS = 3600
+
+_jobs: Dict[str, ImportJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def register_job(job: ImportJob) -> None:
+    with _jobs_lock:
+        _evict_finished_jobs()
+        _jobs[job.id] = job
+
+
+def _evict_finished_jobs() -> None:
+    expired_before = time.monotonic() - FINISHED_JOB_RETENTION_SECONDS
+    for job_id in [
+        job_id
+        for job_id, job in _jobs.items()
+        if job.finished_at is not None and job.finished_at < expired_before
+    ]:
+        del _jobs[job_id]
+
+
+def get_job(job_id: str) -> Optional[ImportJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
@@ -1,21 +1,32 @@
+import contextlib
 import hashlib
+import threading
 import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
+from typing import Iterator
 from typing import Optional
 from typing import List
 from pathlib import Path
 
-from django.contrib.gis.geos import Point
+from django.db import connection
 from django.core.management.base import BaseCommand
 from django.core.management.base import CommandError
 from django.core.management.base import CommandParser
 
+from app.models import DataGeneration
 from app.models import FileHash
 from app.models import PointOfInterest
+from app.partitions import ensure_partition
+from app.partitions import replace_source
+from app.file_processor.dedup import DuplicateExternalIdFilter
 from app.file_processor.file_formats import FileFormatEnum
+from app.file_processor.loader import PointOfInterestLoader
 from app.file_processor.processors import CSVFileProcessor
 from app.file_processor.processors import JSONFileProcessor
 from app.file_processor.processors import XMLFileProcessor
+from app.file_processor.watcher import DirectoryWatcher
 
 
 class Command(BaseCommand):
@@ -28,6 +39,39 @@ class Command(BaseCommand):
             type=str,
             help="Path(s) to CSV, JSON, XML file(s) or directory(ies)",
         )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and import new files as they appear in the directory(ies)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of files imported concurrently in watch mode",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds between directory polls in watch mode",
+        )
+        parser.add_argument(
+            "--source",
+            type=str,
+            default="",
+            help="Provider/source name stored on the imported records",
+        )
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Replace all existing records of --source with the imported file",
+        )
+        parser.add_argument(
+            "--skip-duplicates",
+            action="store_true",
+            help="Skip records whose external ID was already imported or appears earlier in the import",
+        )
     
     def handle(self, *args: Any, **options: Any) -> Optional[str]:
         chunk_size = 8192
@@ -38,13 +82,140 @@ class Command(BaseCommand):
             FileFormatEnum.XML.value: XMLFileProcessor()
         }
 
+        source = options["source"]
+        replace = options["replace"]
+        if replace and not source:
+            raise CommandError("--replace requires --source")
+        if replace and options["watch"]:
+            raise CommandError("--replace cannot be used with --watch")
+
+        if options["watch"]:
+            self._watch(
+                paths=paths,
+                chunk_size=chunk_size,
+                file_processor_map=file_processor_map,
+                workers=options["workers"],
+                poll_interval=options["poll_interval"],
+                source=source,
+                skip_duplicates=options["skip_duplicates"],
+            )
+            return
+
         start_time = time.perf_counter()
         file_paths = self._get_file_paths(paths=paths)
         if not file_paths:
             raise CommandError("No file paths found")
+        if replace and len(file_paths) > 1:
+            raise CommandError("--replace requires a single file")
+
+        # Shared by all files of the run. A replace builds its own, see _process_file.
+        duplicate_filter = None
+        if options["skip_duplicates"] and not replace:
+            duplicate_filter = DuplicateExternalIdFilter(queryset=PointOfInterest.objects.all())
 
         for file_path in file_paths:
-            file_hash = self._get_file_hash(file_path=file_path, chunk_size=chunk_size)
+            self._import_file(
+                file_path=file_path,
+                chunk_size=chunk_size,
+                file_processor_map=file_processor_map,
+                source=source,
+                replace=replace,
+                skip_duplicates=options["skip_duplicates"],
+                duplicate_filter=duplicate_filter,
+            )
+
+        end_time = time.perf_counter()
+        elapsed_time = end_time - start_time
+        print("+++++++++++++++++++++")
+        print(f"Import execution time: {elapsed_time:.6f} seconds")
+        print("+++++++++++++++++++++---")
+
+    def _watch(self, paths: List[str], chunk_size: int, file_processor_map: dict, workers: int, poll_interval: float, source: str, skip_duplicates: bool) -> None:
+        """
+        Polls the directories and imports complete files through a bounded worker pool.
+        Each worker thread keeps its own database connection open between files.
+        """
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
+
+        directories = [Path(p) for p in paths]
+        for directory in directories:
+            if not directory.is_dir():
+                raise CommandError(f"Watch mode requires directory paths, got {directory}")
+
+        # Shared by the workers, so duplicates are detected across all files
+        duplicate_filter = None
+        if skip_duplicates:
+            duplicate_filter = DuplicateExternalIdFilter(queryset=PointOfInterest.objects.all())
+
+        watcher = DirectoryWatcher(
+            directories=directories,
+            suffixes={fmt.value for fmt in FileFormatEnum},
+            settle_seconds=poll_interval,
+        )
+        in_flight = set()
+        in_flight_lock = threading.Lock()
+
+        def on_done(file_path: Path, future: Future) -> None:
+            with in_flight_lock:
+                in_flight.discard(file_path)
+            error = future.exception()
+            if error is not None:
+                self.stdout.write(self.style.ERROR(f"Error processing {file_path}: {error}"))
+
+        self.stdout.write(f"Watching {', '.join(str(d) for d in directories)} for new files")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import") as executor:
+            try:
+                while True:
+                    for file_path in watcher.poll():
+                        with in_flight_lock:
+                            if file_path in in_flight:
+                                # An earlier version is still importing, pick this one up once it's done
+                                watcher.forget(file_path)
+                                continue
+                            in_flight.add(file_path)
+                        future = executor.submit(
+                            self._import_file_in_worker,
+                            file_path=file_path,
+                            chunk_size=chunk_size,
+                            file_processor_map=file_processor_map,
+                            source=source,
+                            duplicate_filter=duplicate_filter,
+                        )
+                        future.add_done_callback(lambda f, p=file_path: on_done(p, f))
+                    time.sleep(poll_interval)
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping watch, waiting for running imports to finish")
+
+    def _import_file_in_worker(self, file_path: Path, chunk_size: int, file_processor_map: dict, source: str, duplicate_filter: Optional[DuplicateExternalIdFilter]) -> None:
+        # Django connections are per thread, so each worker reuses its own
+        # connection across files and only reconnects once it has gone bad.
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+        self._import_file(
+            file_path=file_path,
+            chunk_size=chunk_size,
+            file_processor_map=file_processor_map,
+            source=source,
+            skip_duplicates=duplicate_filter is not None,
+            duplicate_filter=duplicate_filter,
+        )
+
+    def _import_file(
+        self,
+        file_path: Path,
+        chunk_size: int,
+        file_processor_map: dict,
+        source: str,
+        replace: bool = False,
+        skip_duplicates: bool = False,
+        duplicate_filter: Optional[DuplicateExternalIdFilter] = None,
+    ) -> None:
+        """
+        Imports a single file, unless a file with the same contents was already imported
+        """
+        file_hash = self._get_file_hash(file_path=file_path, chunk_size=chunk_size)
+        with self._file_hash_lock(file_hash=file_hash):
             existing_file_hash = FileHash.objects.filter(file_hash=file_hash).exists()
             if existing_file_hash:
                 self.stdout.write(
@@ -52,20 +223,37 @@ class Command(BaseCommand):
                         f"Skipping '{file_path}': File already imported."
                     )
                 )
-                continue
+                return
 
             self._process_file(
                 file_path=file_path,
                 file_hash=file_hash, 
                 batch_size=chunk_size,
-                file_processor_map = file_processor_map
+                file_processor_map = file_processor_map,
+                source=source,
+                replace=replace,
+                skip_duplicates=skip_duplicates,
+                duplicate_filter=duplicate_filter,
             )
 
-        end_time = time.perf_counter()
-        elapsed_time = end_time - start_time
-        print("+++++++++++++++++++++")
-        print(f"Import execution time: {elapsed_time:.6f} seconds")
-        print("+++++++++++++++++++++---")
+    @staticmethod
+    @contextlib.contextmanager
+    def _file_hash_lock(file_hash: str) -> Iterator[None]:
+        """
+        Holds a PostgreSQL advisory lock for the file hash, so files with the same
+        contents imported at the same time (e.g. by watch workers) are imported once.
+        """
+        if connection.vendor != "postgresql":
+            yield
+            return
+        key = int.from_bytes(bytes.fromhex(file_hash[:16]), "big", signed=True)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", [key])
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
 
     @staticmethod
     def _get_file_paths(paths: List[str]) -> List[Path]:
@@ -113,49 +301,69 @@ class Command(BaseCommand):
                 hasher.update(chunk)
         return hasher.hexdigest()
     
-    def _process_file(self, file_path: Path, batch_size: int, file_hash: str, file_processor_map: dict) -> None:
+    def _process_file(
+        self,
+        file_path: Path,
+        batch_size: int,
+        file_hash: str,
+        file_processor_map: dict,
+        source: str,
+        replace: bool,
+        skip_duplicates: bool,
+        duplicate_filter: Optional[DuplicateExternalIdFilter],
+    ) -> None:
         """
-        Processes a file in batches and inserts records in the database table
+        Processes a file in batches and inserts records in the database table.
+        With `replace`, the records replace the existing records of `source`.
+        With `skip_duplicates`, records with an already imported external ID are dropped.
         """
-        batch = []
-        total_imported = 0
+        def on_batch(inserted: int) -> None:
+            # Batches are committed one at a time, so cached query results are
+            # invalidated as soon as each batch's rows are visible. A replace
+            # only becomes visible once complete, see below.
+            if inserted > 0 and not replace:
+                DataGeneration.increment()
 
         try:
             processor_key = file_path.suffix.lower()
             file_processor = file_processor_map.get(processor_key)
             row_iter = file_processor.read_file_content(file_path=file_path)
-            for row in row_iter:
-                row_dict = file_processor.row_to_dict(row=row)
-                poi = PointOfInterest(
-                    external_id=row_dict.get("external_id"),
-                    name=row_dict.get("name"),
-                    description=row_dict.get("description", ""),
-                    category=row_dict.get("category"),
-                    point=Point(float(row_dict.get("latitude")), float(row_dict.get("longitude"))),
-                    average_rating=row_dict.get("average_rating"),
-                    ratings=row_dict.get("ratings"),
+            if replace:
+                target = replace_source(source=source)
+            else:
+                ensure_partition(source=source)
+                target = contextlib.nullcontext(PointOfInterest)
+            with target as model:
+                if skip_duplicates and replace:
+                    # The source's old records are being replaced, so only other
+                    # sources and the records loaded now count as duplicates
+                    duplicate_filter = DuplicateExternalIdFilter(
+                        queryset=PointOfInterest.objects.exclude(source=source),
+                        loaded_queryset=model.objects.filter(source=source),
+                    )
+                loader = PointOfInterestLoader(
+                    batch_size=batch_size,
+                    source=source,
+                    model=model,
+                    duplicate_filter=duplicate_filter,
                 )
-                batch.append(poi)
-                if len(batch) >= batch_size:
-                    self._bulk_insert(batch=batch)
-                    total_imported += len(batch)
-                    batch.clear()
-
-            # Insert any remaining records in the last batch
-            if batch:
-                self._bulk_insert(batch)
-                total_imported += len(batch)
+                total_imported = loader.load(file_processor=file_processor, rows=row_iter, on_batch=on_batch)
+            if replace:
+                # The source's rows were replaced, even if the file was empty
+                DataGeneration.increment()
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Successfully imported {total_imported} Point of Interest records from {file_path}"
                 )
             )
+            if skip_duplicates and loader.duplicates_removed > 0:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Skipped {loader.duplicates_removed} duplicate Point of Interest records from {file_path}"
+                    )
+                )
             if total_imported > 0:
                 # Add hash for imported file
                 FileHash.objects.create(file_hash=file_hash)
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Error processing {file_path}: {e}"))
-
-    @staticmethod
-    def _bulk_insert(batch: List[PointOfInterest]) -> None:
-        PointOfInterest.objects.bulk_create(batch, ignore_conflicts=True)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_datageneration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pointofinterest',
+            name='source',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+    ]
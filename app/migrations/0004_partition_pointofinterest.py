@@ -0,0 +1,90 @@
+import hashlib
+import re
+
+from django.conf import settings
+from django.db import migrations
+from django.db.migrations.exceptions import IrreversibleError
+
+TABLE = 'app_pointofinterest'
+
+# Frozen copies of app.partitions.PARTITION_INDEXES and partition_table_name as
+# of this migration, so later changes there don't change what it does.
+PARTITION_INDEXES = {
+    'external_id': '(external_id)',
+    'category': '(category)',
+    'source': '(source)',
+    'point': 'USING GIST (point)',
+}
+
+
+def partition_table_name(source):
+    slug = re.sub(r'[^a-z0-9]+', '_', source.lower()).strip('_')
+    digest = hashlib.sha1(source.encode()).hexdigest()[:8]
+    prefix = f'{TABLE}_'
+    slug = slug[:63 - len(prefix) - len(digest) - len('__new')]
+    return f'{prefix}{slug}_{digest}'
+
+
+def partition_point_of_interest(apps, schema_editor):
+    """
+    Turns app_pointofinterest into a table partitioned by LIST (source), with one
+    partition per source and no DEFAULT partition, so attaching a partition never
+    has to scan other rows. Only runs when POI_PARTITIONED is enabled.
+
+    Identity columns are not supported on partitioned tables before
+    PostgreSQL 17, so ids come from a plain sequence shared by all partitions.
+    """
+    if not settings.POI_PARTITIONED or schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # The existing table becomes the partition of records without a source
+    legacy = partition_table_name(source='')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+            [TABLE],
+        )
+        legacy_pkey = cursor.fetchone()[0]
+        cursor.execute(f"SELECT DISTINCT source FROM {TABLE} WHERE source <> ''")
+        sources = [row[0] for row in cursor.fetchall()]
+
+    schema_editor.execute(f'ALTER TABLE {TABLE} RENAME TO {legacy}')
+    schema_editor.execute(f'ALTER TABLE {legacy} ALTER COLUMN id DROP IDENTITY IF EXISTS')
+    schema_editor.execute(f'CREATE TABLE {TABLE} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY LIST (source)')
+    schema_editor.execute(f'CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id')
+    schema_editor.execute(f"SELECT setval('{TABLE}_id_seq', COALESCE((SELECT MAX(id) FROM {legacy}), 0) + 1, false)")
+    schema_editor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+    schema_editor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_partitioned_pkey PRIMARY KEY (id, source)')
+    for name, definition in PARTITION_INDEXES.items():
+        schema_editor.execute(f'CREATE INDEX {TABLE}_partitioned_{name} ON {TABLE} {definition}')
+
+    # Records already tagged with a source move to that source's partition, once
+    for source in sources:
+        partition = partition_table_name(source=source)
+        schema_editor.execute(f'CREATE TABLE {partition} PARTITION OF {TABLE} FOR VALUES IN (%s)', [source])
+        schema_editor.execute(f'INSERT INTO {partition} SELECT * FROM {legacy} WHERE source = %s', [source])
+        schema_editor.execute(f'DELETE FROM {legacy} WHERE source = %s', [source])
+
+    # A partition's primary key must match the parent's. The CHECK constraint
+    # lets ATTACH PARTITION skip validating the rows.
+    schema_editor.execute(f'ALTER TABLE {legacy} DROP CONSTRAINT {legacy_pkey}')
+    schema_editor.execute(f'ALTER TABLE {legacy} ADD PRIMARY KEY (id, source)')
+    schema_editor.execute(f"ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_source CHECK (source = '')")
+    schema_editor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {legacy} FOR VALUES IN ('')")
+
+
+def unpartition_point_of_interest(apps, schema_editor):
+    if not settings.POI_PARTITIONED or schema_editor.connection.vendor != 'postgresql':
+        return
+    raise IrreversibleError('The partitioned app_pointofinterest table cannot be converted back automatically.')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_pointofinterest_source'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_point_of_interest, unpartition_point_of_interest),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.gis.db.models import PointField
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db.models import F
 
 
 class PointOfInterest(models.Model):
@@ -11,6 +12,8 @@ class PointOfInterest(models.Model):
     point = PointField()
     average_rating = models.FloatField()
     ratings = ArrayField(models.FloatField(), blank=True, default=list)
+    # Provider/source of the record. Also the partition key when the table is partitioned.
+    source = models.CharField(max_length=255, default="", blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self) -> str:
@@ -20,3 +23,22 @@ class PointOfInterest(models.Model):
 class FileHash(models.Model):
     file_hash = models.CharField(max_length=64, db_index=True, unique=True)
     created_date = models.DateTimeField(auto_now_add=True)
+
+
+class DataGeneration(models.Model):
+    """
+    Single row counter, incremented whenever an import commits rows.
+    Query results are cached per generation, so a new import makes
+    previously cached results unreachable.
+    """
+    value = models.BigIntegerField(default=0)
+
+    @classmethod
+    def current(cls) -> int:
+        value = cls.objects.filter(pk=1).values_list("value", flat=True).first()
+        return value or 0
+
+    @classmethod
+    def increment(cls) -> None:
+        # The row is created by the migration, so this is always a single UPDATE
+        cls.objects.filter(pk=1).update(value=F("value") + 1)
@@ -0,0 +1,138 @@
+import hashlib
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+from typing import Type
+
+from django.db import connection
+from django.db import models
+from django.db import transaction
+
+from app.models import PointOfInterest
+
+MAX_TABLE_NAME_LENGTH = 63
+
+# Indexes of the partitioned table, besides the (id, source) primary key. Partitions
+# loaded outside the table get the same indexes, so attaching them reuses these
+# instead of building new ones.
+PARTITION_INDEXES = {
+    "external_id": "(external_id)",
+    "category": "(category)",
+    "source": "(source)",
+    "point": "USING GIST (point)",
+}
+
+
+def is_partitioned() -> bool:
+    """
+    Whether the PointOfInterest table was partitioned by the migrations (see POI_PARTITIONED).
+    """
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+            [PointOfInterest._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def partition_table_name(source: str) -> str:
+    """
+    Returns:
+        A valid, stable table name for the partition holding `source`.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", source.lower()).strip("_")
+    digest = hashlib.sha1(source.encode()).hexdigest()[:8]
+    # Leave room for the "_new" suffix used while loading
+    prefix = f"{PointOfInterest._meta.db_table}_"
+    slug = slug[:MAX_TABLE_NAME_LENGTH - len(prefix) - len(digest) - len("__new")]
+    return f"{prefix}{slug}_{digest}"
+
+
+def ensure_partition(source: str) -> None:
+    """
+    Creates the partition for `source` if the table is partitioned and it does
+    not exist yet. There is no DEFAULT partition, so rows need their own one.
+    """
+    if not is_partitioned():
+        return
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote(partition_table_name(source=source))} "
+            f"PARTITION OF {quote(PointOfInterest._meta.db_table)} FOR VALUES IN (%s)",
+            [source],
+        )
+
+
+@lru_cache(maxsize=None)
+def partition_model(table_name: str) -> Type[models.Model]:
+    """
+    Unmanaged model with the PointOfInterest fields, stored in `table_name`,
+    so rows can be bulk inserted into a partition that is not attached yet.
+    """
+    attrs = {
+        "__module__": PointOfInterest.__module__,
+        "Meta": type("Meta", (), {"db_table": table_name, "managed": False, "app_label": "app"}),
+    }
+    for field in PointOfInterest._meta.concrete_fields:
+        attrs[field.name] = field.clone()
+    class_name = "PointOfInterest_" + table_name[len(PointOfInterest._meta.db_table) + 1:]
+    return type(class_name, (models.Model,), attrs)
+
+
+@contextmanager
+def replace_source(source: str) -> Iterator[Type[models.Model]]:
+    """
+    Yields the model to load a source's new rows into. When the block
+    completes, the new rows replace the previous rows of that source.
+
+    Partitioned tables load into a new, unattached table and index it, then
+    detach and drop the old partition and attach the new one in one short
+    transaction. Attaching neither builds indexes nor scans rows: the new table
+    already has the indexes, and a CHECK constraint proves its rows belong to
+    the source. Otherwise the old rows are deleted in the same transaction as the load.
+    """
+    if not is_partitioned():
+        with transaction.atomic():
+            PointOfInterest.objects.filter(source=source).delete()
+            yield PointOfInterest
+        return
+
+    quote = connection.ops.quote_name
+    parent = quote(PointOfInterest._meta.db_table)
+    partition = partition_table_name(source=source)
+    staging = f"{partition}_new"
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {quote(staging)}")
+        cursor.execute(
+            f"CREATE TABLE {quote(staging)} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(staging)} ADD CONSTRAINT {quote(staging + '_source')} CHECK (source = %s)",
+            [source],
+        )
+
+    try:
+        yield partition_model(table_name=staging)
+        # Build the indexes after loading, outside the swap transaction
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {quote(staging)} ADD PRIMARY KEY (id, source)")
+            for definition in PARTITION_INDEXES.values():
+                cursor.execute(f"CREATE INDEX ON {quote(staging)} {definition}")
+    except BaseException:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(staging)}")
+        raise
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [partition])
+        if cursor.fetchone()[0] is not None:
+            cursor.execute(f"ALTER TABLE {parent} DETACH PARTITION {quote(partition)}")
+            cursor.execute(f"DROP TABLE {quote(partition)}")
+        cursor.execute(f"ALTER TABLE {parent} ATTACH PARTITION {quote(staging)} FOR VALUES IN (%s)", [source])
+        cursor.execute(f"ALTER TABLE {quote(staging)} RENAME TO {quote(partition)}")
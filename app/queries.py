@@ -0,0 +1,89 @@
+from typing import List
+
+from django.contrib.gis.geos import Polygon
+from django.db.models.expressions import RawSQL
+
+from app.cache import poi_query_cache
+from app.models import PointOfInterest
+
+MAX_LIMIT = 1000
+COORDINATE_PRECISION = 6
+
+# Points are stored as Point(latitude, longitude), so lookups are built the same way.
+
+
+def pois_by_category(category: str, limit: int) -> List[dict]:
+    params = {"category": category.strip(), "limit": _normalise_limit(limit)}
+    return poi_query_cache.get_or_set(
+        name="category",
+        params=params,
+        query=lambda: _serialise(
+            PointOfInterest.objects.filter(category=params["category"]).order_by("id")[:params["limit"]]
+        ),
+    )
+
+
+def nearest_pois(latitude: float, longitude: float, limit: int) -> List[dict]:
+    params = {
+        "latitude": _normalise_coordinate(latitude),
+        "longitude": _normalise_coordinate(longitude),
+        "limit": _normalise_limit(limit),
+    }
+    # KNN ordering with the <-> operator is answered from the GIST index on
+    # point, rather than computing the distance to every row. The distance is
+    # planar in degrees, so it does not depend on the (latitude, longitude) axis order.
+    distance = RawSQL(
+        f"{PointOfInterest._meta.db_table}.point <-> ST_SetSRID(ST_MakePoint(%s, %s), 4326)",
+        (params["latitude"], params["longitude"]),
+    )
+    return poi_query_cache.get_or_set(
+        name="nearest",
+        params=params,
+        query=lambda: _serialise(
+            PointOfInterest.objects.order_by(distance)[:params["limit"]]
+        ),
+    )
+
+
+def pois_in_bbox(min_latitude: float, min_longitude: float, max_latitude: float, max_longitude: float, limit: int) -> List[dict]:
+    params = {
+        "min_latitude": _normalise_coordinate(min_latitude),
+        "min_longitude": _normalise_coordinate(min_longitude),
+        "max_latitude": _normalise_coordinate(max_latitude),
+        "max_longitude": _normalise_coordinate(max_longitude),
+        "limit": _normalise_limit(limit),
+    }
+    bbox = Polygon.from_bbox(
+        (params["min_latitude"], params["min_longitude"], params["max_latitude"], params["max_longitude"])
+    )
+    bbox.srid = 4326
+    return poi_query_cache.get_or_set(
+        name="bbox",
+        params=params,
+        query=lambda: _serialise(
+            PointOfInterest.objects.filter(point__within=bbox).order_by("id")[:params["limit"]]
+        ),
+    )
+
+
+def _normalise_limit(limit: int) -> int:
+    return max(1, min(int(limit), MAX_LIMIT))
+
+
+def _normalise_coordinate(value: float) -> float:
+    return round(float(value), COORDINATE_PRECISION)
+
+
+def _serialise(queryset) -> List[dict]:
+    return [
+        {
+            "id": poi.id,
+            "external_id": poi.external_id,
+            "name": poi.name,
+            "category": poi.category,
+            "latitude": poi.point.x,
+            "longitude": poi.point.y,
+            "average_rating": poi.average_rating,
+        }
+        for poi in queryset
+    ]
@@ -0,0 +1,62 @@
+import io
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.core.management import call_command
+from app.models import PointOfInterest
+from app.file_processor.dedup import BloomFilter
+from app.file_processor.dedup import ScalableBloomFilter
+from app.tests.utils import write_poi_csv
+
+
+class BloomFilterTests(SimpleTestCase):
+
+    def test_added_values_found(self):
+        bloom = BloomFilter(capacity=1000)
+        for value in range(1000):
+            bloom.add(str(value))
+
+        self.assertTrue(all(str(value) in bloom for value in range(1000)))
+        false_positives = sum(str(value) in bloom for value in range(1000, 11000))
+        self.assertLess(false_positives, 300)
+
+    def test_scalable_filter_keeps_error_rate_past_capacity(self):
+        bloom = ScalableBloomFilter(initial_capacity=1000)
+        for value in range(20000):
+            bloom.add(str(value))
+
+        self.assertGreater(len(bloom.filters), 1)
+        self.assertTrue(all(str(value) in bloom for value in range(20000)))
+        false_positives = sum(str(value) in bloom for value in range(20000, 30000))
+        self.assertLess(false_positives, 300)
+
+
+class SkipDuplicatesImportTests(TestCase):
+
+    def test_duplicates_in_file_skipped(self):
+        out = io.StringIO()
+        file_name = write_poi_csv(self, ids=[1, 1, 2])
+        call_command("import", file_name, "--skip-duplicates", stdout=out)
+
+        self.assertEqual(PointOfInterest.objects.count(), 2)
+        self.assertEqual(PointOfInterest.objects.get(external_id=1).name, "POI 1 0")
+        self.assertIn(f"Skipped 1 duplicate Point of Interest records from {file_name}", out.getvalue())
+
+    def test_duplicates_across_files_skipped(self):
+        call_command("import", write_poi_csv(self, ids=[1, 2]))
+        call_command("import", write_poi_csv(self, ids=[2, 3]), "--skip-duplicates")
+
+        self.assertEqual(
+            sorted(PointOfInterest.objects.values_list("external_id", flat=True)),
+            ["1", "2", "3"],
+        )
+
+    def test_no_skipped_message_without_duplicates(self):
+        out = io.StringIO()
+        call_command("import", write_poi_csv(self, ids=[1, 2]), "--skip-duplicates", stdout=out)
+
+        self.assertNotIn("duplicate", out.getvalue())
+
+    def test_duplicates_kept_by_default(self):
+        call_command("import", write_poi_csv(self, ids=[1, 1]))
+
+        self.assertEqual(PointOfInterest.objects.count(), 2)
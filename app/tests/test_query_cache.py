@@ -0,0 +1,127 @@
+from unittest import mock
+from django.core.management import call_command
+from django.contrib.gis.geos import Point
+from django.test import SimpleTestCase
+from django.test import TestCase
+from app.cache import LRUCache
+from app.cache import QueryCache
+from app.cache import poi_query_cache
+from app.models import DataGeneration
+from app.models import FileHash
+from app.models import PointOfInterest
+from app.tests.utils import write_poi_csv
+
+
+class LRUCacheTests(SimpleTestCase):
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entry_not_returned(self):
+        cache = LRUCache(max_entries=2, ttl=60)
+        with mock.patch("app.cache.time.monotonic", return_value=0):
+            cache.set("a", 1)
+        with mock.patch("app.cache.time.monotonic", return_value=61):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.size_bytes, 0)
+
+
+class QueryCacheTests(TestCase):
+
+    def test_results_cached_until_generation_changes(self):
+        cache = QueryCache(max_entries=10, ttl=60)
+        query = mock.Mock(return_value=["result"])
+
+        cache.get_or_set(name="category", params={"category": "restaurant"}, query=query)
+        cache.get_or_set(name="category", params={"category": "restaurant"}, query=query)
+        self.assertEqual(query.call_count, 1)
+
+        DataGeneration.increment()
+        cache.get_or_set(name="category", params={"category": "restaurant"}, query=query)
+        self.assertEqual(query.call_count, 2)
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertGreater(stats["size_bytes"], 0)
+
+
+class POIQueryViewTests(TestCase):
+
+    def setUp(self) -> None:
+        poi_query_cache.clear()
+        PointOfInterest.objects.create(
+            external_id="1",
+            name="ちぬまん",
+            description="",
+            category="restaurant",
+            point=Point(26.2155192001422, 127.6854314),
+            average_rating=3.0,
+            ratings=[3.0],
+        )
+
+    def test_pois_by_category(self):
+        response = self.client.get("/pois/", {"category": "restaurant"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["name"], "ちぬまん")
+
+    def test_nearest_pois(self):
+        response = self.client.get("/pois/nearest/", {"latitude": 26.2, "longitude": 127.6, "limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["external_id"], "1")
+
+    def test_nearest_pois_ordered_by_distance(self):
+        for external_id, latitude, longitude in [("far", 43.7149419232782, -75.3263056920684), ("near", 26.2, 127.6)]:
+            PointOfInterest.objects.create(
+                external_id=external_id,
+                name=external_id,
+                description="",
+                category="restaurant",
+                point=Point(latitude, longitude),
+                average_rating=3.0,
+                ratings=[3.0],
+            )
+
+        response = self.client.get("/pois/nearest/", {"latitude": 26.2, "longitude": 127.6, "limit": 3})
+        self.assertEqual(
+            [poi["external_id"] for poi in response.json()["results"]],
+            ["near", "1", "far"],
+        )
+
+    def test_pois_in_bbox(self):
+        response = self.client.get("/pois/bbox/", {
+            "min_latitude": 26, "min_longitude": 127, "max_latitude": 27, "max_longitude": 128,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_missing_parameter(self):
+        response = self.client.get("/pois/nearest/", {"latitude": 26.2})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "longitude is required")
+
+
+class DataGenerationImportTests(TestCase):
+
+    def test_replace_with_empty_file_increments_generation(self):
+        generation = DataGeneration.current()
+
+        call_command("import", write_poi_csv(self, ids=[]), "--source", "provider-a", "--replace")
+        self.assertEqual(DataGeneration.current(), generation + 1)
+
+    def test_generation_incremented_as_batches_commit(self):
+        # Incremented as the batch is committed, before the import finishes
+        file_hash_existed = []
+        with mock.patch.object(DataGeneration, "increment", side_effect=lambda: file_hash_existed.append(FileHash.objects.exists())):
+            call_command("import", write_poi_csv(self, ids=[1, 2]))
+
+        self.assertEqual(file_hash_existed, [False])
@@ -0,0 +1,102 @@
+import importlib
+from django.apps import apps
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from app.models import PointOfInterest
+from app.partitions import is_partitioned
+from app.partitions import partition_table_name
+from app.tests.utils import write_poi_csv
+
+partition_migration = importlib.import_module("app.migrations.0004_partition_pointofinterest")
+
+
+class ReplaceSourceImportTests(TestCase):
+
+    def test_replace_source_records(self):
+        call_command("import", write_poi_csv(self, ids=[1, 2, 3]), "--source", "provider-a")
+        call_command("import", write_poi_csv(self, ids=[4]), "--source", "provider-b")
+        call_command("import", write_poi_csv(self, ids=[5, 6]), "--source", "provider-a", "--replace")
+
+        self.assertEqual(
+            sorted(PointOfInterest.objects.filter(source="provider-a").values_list("external_id", flat=True)),
+            ["5", "6"],
+        )
+        self.assertEqual(PointOfInterest.objects.filter(source="provider-b").count(), 1)
+
+    def test_replace_requires_source(self):
+        with self.assertRaisesMessage(CommandError, "--replace requires --source"):
+            call_command("import", write_poi_csv(self, ids=[1]), "--replace")
+
+
+class PartitionedReplaceSourceTests(TestCase):
+    """
+    Partitions the table inside the test transaction (PostgreSQL DDL is
+    transactional), so it is back to a plain table for the other tests.
+    """
+
+    def setUp(self) -> None:
+        for external_id, source in [("legacy", ""), ("old", "provider-a")]:
+            PointOfInterest.objects.create(
+                external_id=external_id,
+                name=external_id,
+                description="",
+                category="restaurant",
+                point=Point(26.2155192001422, 127.6854314),
+                average_rating=3.0,
+                ratings=[3.0],
+                source=source,
+            )
+        with override_settings(POI_PARTITIONED=True), connection.schema_editor() as schema_editor:
+            partition_migration.partition_point_of_interest(apps, schema_editor)
+
+    def _partition_of(self, external_id: str) -> str:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM app_pointofinterest WHERE external_id = %s",
+                [external_id],
+            )
+            return cursor.fetchone()[0]
+
+    def test_existing_records_moved_to_partitions(self):
+        self.assertTrue(is_partitioned())
+        self.assertEqual(self._partition_of("legacy"), partition_table_name(""))
+        self.assertEqual(self._partition_of("old"), partition_table_name("provider-a"))
+
+    def test_replace_source_swaps_partition(self):
+        call_command("import", write_poi_csv(self, ids=[5, 6]), "--source", "provider-a", "--replace")
+
+        self.assertEqual(
+            sorted(PointOfInterest.objects.filter(source="provider-a").values_list("external_id", flat=True)),
+            ["5", "6"],
+        )
+        self.assertEqual(self._partition_of("5"), partition_table_name("provider-a"))
+        self.assertTrue(PointOfInterest.objects.filter(external_id="legacy").exists())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [partition_table_name("provider-a") + "_new"])
+            self.assertIsNone(cursor.fetchone()[0])
+
+    def test_import_creates_partition_for_new_source(self):
+        call_command("import", write_poi_csv(self, ids=[7]), "--source", "provider-b")
+
+        self.assertEqual(self._partition_of("7"), partition_table_name("provider-b"))
+        self.assertEqual(PointOfInterest.objects.count(), 3)
+
+
+class PartitionTableNameTests(SimpleTestCase):
+
+    def test_migration_partition_names_match(self):
+        for source in ["", "provider-a", "x" * 200]:
+            self.assertEqual(partition_migration.partition_table_name(source), partition_table_name(source))
+
+    def test_partition_table_name(self):
+        self.assertRegex(partition_table_name("Provider A"), r"^app_pointofinterest_provider_a_[0-9a-f]{8}$")
+
+    def test_long_partition_table_name(self):
+        name = partition_table_name("x" * 200)
+        self.assertLessEqual(len(name + "_new"), 63)
+        self.assertNotEqual(name, partition_table_name("x" * 201))
@@ -0,0 +1,195 @@
+import asyncio
+import contextlib
+import io
+import json
+import threading
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+from unittest import mock
+from app.jobs import FINISHED_JOB_RETENTION_SECONDS
+from app.jobs import ImportJob
+from app.jobs import get_job
+from app.jobs import register_job
+from app.models import FileHash
+from app.models import PointOfInterest
+from app.uploads import UploadRouter
+from app.uploads import _import_slots
+from app.uploads import run_import_job
+from app.file_processor.processors import CSVFileProcessor
+from app.file_processor.processors import JSONFileProcessor
+from app.file_processor.streams import ChunkStream
+
+
+class ChunkStreamTests(SimpleTestCase):
+
+    def test_rows_read_from_streamed_chunks(self):
+        stream = ChunkStream(max_chunks=2)
+        chunks = [
+            b"poi_id,poi_name,poi_category,poi_latitude,poi_longitude,poi_ratings\n1,\xe3\x81\xa1",
+            b"\xe3\x81\xac\xe3\x81\xbe\xe3\x82\x93,restaurant,26.21,127.68,\"{3.0,4.0}\"\n",
+            b"2,Otter Creek State Forest,nature-reserve,43.71,-75.32,\"{3.0,5.0}\"\n",
+        ]
+
+        def write():
+            for chunk in chunks:
+                stream.put(chunk)
+            stream.finish()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        rows = list(CSVFileProcessor().read_stream(stream=io.BufferedReader(stream)))
+        writer.join()
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["poi_name"], "ちぬまん")
+        self.assertEqual(rows[1]["poi_category"], "nature-reserve")
+
+    def test_json_items_read_from_streamed_chunks(self):
+        stream = ChunkStream(max_chunks=2)
+        data = json.dumps([{"id": 1, "name": "ちぬまん"}, {"id": 2, "name": "Otter Creek State Forest"}]).encode()
+
+        def write():
+            for start in range(0, len(data), 5):
+                stream.put(data[start:start + 5])
+            stream.finish()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        processor = JSONFileProcessor()
+        processor.read_size = 8
+        rows = list(processor.read_stream(stream=io.BufferedReader(stream)))
+        writer.join()
+
+        self.assertEqual([row["name"] for row in rows], ["ちぬまん", "Otter Creek State Forest"])
+
+    def test_aborted_stream_stops_reader(self):
+        stream = ChunkStream()
+        stream.abort()
+        with self.assertRaises(IOError):
+            stream.read(1)
+
+
+@override_settings(IMPORT_UPLOAD_TOKEN="secret")
+class UploadRouterTests(SimpleTestCase):
+
+    def _communicator(self, query_string: bytes, token: str = "secret") -> ApplicationCommunicator:
+        return ApplicationCommunicator(UploadRouter(application=None), {
+            "type": "http",
+            "method": "POST",
+            "path": "/imports/",
+            "query_string": query_string,
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        })
+
+    async def _response(self, communicator: ApplicationCommunicator) -> tuple:
+        await communicator.send_input({"type": "http.request", "body": b"", "more_body": False})
+        start = await communicator.receive_output()
+        body = await communicator.receive_output()
+        return start["status"], json.loads(body["body"])
+
+    async def test_unsupported_format_rejected(self):
+        status, body = await self._response(self._communicator(b"format=txt"))
+
+        self.assertEqual(status, 400)
+        self.assertIn("Unsupported file format", body["error"])
+
+    @override_settings(IMPORT_UPLOAD_SOURCES=["provider-a"])
+    async def test_unknown_source_rejected(self):
+        status, body = await self._response(self._communicator(b"format=csv&source=made-up"))
+
+        self.assertEqual(status, 400)
+        self.assertEqual(body["error"], "Unknown source made-up")
+
+    async def test_invalid_token_rejected(self):
+        status, _ = await self._response(self._communicator(b"format=csv", token="wrong"))
+        self.assertEqual(status, 401)
+
+    @override_settings(IMPORT_UPLOAD_TOKEN="")
+    async def test_uploads_disabled_without_token(self):
+        status, _ = await self._response(self._communicator(b"format=csv"))
+        self.assertEqual(status, 403)
+
+    async def test_cancelled_upload_aborts_stream(self):
+        communicator = self._communicator(b"format=csv")
+        with mock.patch("app.uploads._import_executor") as executor:
+            await communicator.send_input({"type": "http.request", "body": b"poi_id", "more_body": True})
+            await asyncio.sleep(0.1)
+            communicator.future.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await communicator.wait()
+        # The import never ran, so give back the slot it was holding
+        _import_slots.release()
+
+        stream = executor.submit.call_args.kwargs["stream"]
+        with self.assertRaises(IOError):
+            stream.read()
+
+
+class RunImportJobTests(TestCase):
+
+    csv_data = (
+        "poi_id,poi_name,poi_category,poi_latitude,poi_longitude,poi_ratings\n"
+        "1,ちぬまん,restaurant,26.2155192001422,127.6854314,\"{3.0,4.0}\"\n"
+        "2,Otter Creek State Forest,nature-reserve,43.7149419232782,-75.3263056920684,\"{3.0,5.0}\"\n"
+    ).encode()
+
+    def _filled_stream(self) -> ChunkStream:
+        stream = ChunkStream(max_chunks=4)
+        stream.put(self.csv_data[:50])
+        stream.put(self.csv_data[50:])
+        stream.finish()
+        return stream
+
+    def test_streamed_rows_imported(self):
+        job = ImportJob(file_format=".csv")
+        job.file_hash = "a" * 64
+        run_import_job(job=job, file_processor=CSVFileProcessor(), stream=self._filled_stream(), source="upload")
+
+        self.assertEqual(job.status, ImportJob.COMPLETED)
+        self.assertEqual(job.rows_processed, 2)
+        self.assertEqual(PointOfInterest.objects.filter(source="upload").count(), 2)
+        self.assertTrue(FileHash.objects.filter(file_hash=job.file_hash).exists())
+
+    def test_already_imported_file_rolled_back(self):
+        FileHash.objects.create(file_hash="b" * 64)
+        job = ImportJob(file_format=".csv")
+        job.file_hash = "b" * 64
+        run_import_job(job=job, file_processor=CSVFileProcessor(), stream=self._filled_stream())
+
+        self.assertEqual(job.status, ImportJob.SKIPPED)
+        self.assertEqual(PointOfInterest.objects.count(), 0)
+
+
+class ImportJobRegistryTests(SimpleTestCase):
+
+    def test_finished_jobs_evicted(self):
+        old_job = ImportJob(file_format=".csv")
+        register_job(old_job)
+        with mock.patch("app.jobs.time.monotonic", return_value=0):
+            old_job.finish(ImportJob.COMPLETED)
+
+        new_job = ImportJob(file_format=".csv")
+        with mock.patch("app.jobs.time.monotonic", return_value=FINISHED_JOB_RETENTION_SECONDS + 1):
+            register_job(new_job)
+        self.assertIsNone(get_job(old_job.id))
+        self.assertIs(get_job(new_job.id), new_job)
+
+
+class ImportJobStatusViewTests(TestCase):
+
+    def test_job_status(self):
+        job = ImportJob(file_format=".csv")
+        job.rows_processed = 2
+        job.finish(ImportJob.COMPLETED)
+        register_job(job)
+
+        response = self.client.get(f"/imports/{job.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "completed")
+        self.assertEqual(response.json()["rows_processed"], 2)
+
+    def test_unknown_job_status(self):
+        response = self.client.get("/imports/unknown/")
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,41 @@
+import hashlib
+import io
+from pathlib import Path
+from django.core.management import load_command_class
+from django.test import TestCase
+from app.models import FileHash
+from app.models import PointOfInterest
+from app.file_processor.processors import CSVFileProcessor
+from app.tests.utils import write_poi_csv
+
+
+class ImportFileInWorkerTests(TestCase):
+
+    def setUp(self) -> None:
+        self.out = io.StringIO()
+        command_class = type(load_command_class("app", "import"))
+        self.command = command_class(stdout=self.out)
+        self.file_path = Path(write_poi_csv(self, ids=[1, 2]))
+
+    def _import_file_in_worker(self) -> None:
+        self.command._import_file_in_worker(
+            file_path=self.file_path,
+            chunk_size=8192,
+            file_processor_map={".csv": CSVFileProcessor()},
+            source="watched",
+            duplicate_filter=None,
+        )
+
+    def test_file_imported(self):
+        self._import_file_in_worker()
+
+        self.assertEqual(PointOfInterest.objects.filter(source="watched").count(), 2)
+        file_hash = hashlib.sha256(self.file_path.read_bytes()).hexdigest()
+        self.assertTrue(FileHash.objects.filter(file_hash=file_hash).exists())
+
+    def test_same_file_imported_once(self):
+        self._import_file_in_worker()
+        self._import_file_in_worker()
+
+        self.assertEqual(PointOfInterest.objects.count(), 2)
+        self.assertIn("File already imported", self.out.getvalue())
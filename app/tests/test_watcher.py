@@ -0,0 +1,80 @@
+import os
+import time
+from pathlib import Path
+from unittest import mock
+from tempfile import TemporaryDirectory
+from django.test import SimpleTestCase
+from app.file_processor.watcher import DirectoryWatcher
+
+
+class DirectoryWatcherTests(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name)
+        self.watcher = DirectoryWatcher(
+            directories=[self.directory],
+            suffixes={".csv", ".json", ".xml"},
+            settle_seconds=60,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_file_reported_once_stat_is_stable(self):
+        file_path = self.directory / "pois.csv"
+        file_path.write_text("poi_id\n")
+
+        # First poll only records the stat, second poll sees it unchanged
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [file_path])
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_growing_file_not_reported(self):
+        file_path = self.directory / "pois.csv"
+        file_path.write_text("poi_id\n")
+        self.watcher.poll()
+
+        with file_path.open("a") as f:
+            f.write("1\n")
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [file_path])
+
+    def test_settled_file_reported_immediately(self):
+        file_path = self.directory / "pois.json"
+        file_path.write_text("[]")
+        old_time = time.time() - 120
+        os.utime(file_path, (old_time, old_time))
+
+        self.assertEqual(self.watcher.poll(), [file_path])
+
+    def test_unsupported_files_ignored(self):
+        file_path = self.directory / "notes.txt"
+        file_path.write_text("notes")
+        old_time = time.time() - 120
+        os.utime(file_path, (old_time, old_time))
+
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_file_removed_during_poll_skipped(self):
+        file_path = self.directory / "pois.csv"
+        file_path.write_text("poi_id\n")
+        entries = list(os.scandir(self.directory))
+        file_path.unlink()
+
+        with mock.patch("app.file_processor.watcher.os.scandir", return_value=entries):
+            self.assertEqual(self.watcher.poll(), [])
+
+    def test_missing_directory_skipped(self):
+        self.temp_dir.cleanup()
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_forgotten_file_reported_again(self):
+        file_path = self.directory / "pois.json"
+        file_path.write_text("[]")
+        old_time = time.time() - 120
+        os.utime(file_path, (old_time, old_time))
+
+        self.assertEqual(self.watcher.poll(), [file_path])
+        self.watcher.forget(file_path)
+        self.assertEqual(self.watcher.poll(), [file_path])
@@ -0,0 +1,28 @@
+import csv
+import os
+from tempfile import NamedTemporaryFile
+from unittest import TestCase
+
+POI_CSV_FIELDNAMES = ["poi_id", "poi_name", "poi_category", "poi_latitude", "poi_longitude", "poi_ratings"]
+
+
+def write_poi_csv(test_case: TestCase, ids: list) -> str:
+    """
+    Writes a CSV file with a Point of Interest record per id, removed when the test ends.
+    Records are named "POI <id> <position>", so repeated ids can be told apart.
+    """
+    temp_file = NamedTemporaryFile(mode="w+", delete=False, suffix=".csv")
+    writer = csv.DictWriter(temp_file, fieldnames=POI_CSV_FIELDNAMES)
+    writer.writeheader()
+    for index, poi_id in enumerate(ids):
+        writer.writerow({
+            "poi_id": poi_id,
+            "poi_name": f"POI {poi_id} {index}",
+            "poi_category": "restaurant",
+            "poi_latitude": "26.2155192001422",
+            "poi_longitude": "127.6854314",
+            "poi_ratings": "{3.0,4.0}",
+        })
+    temp_file.close()
+    test_case.addCleanup(os.unlink, temp_file.name)
+    return temp_file.name
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import hmac
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+
+from app.jobs import ImportJob
+from app.jobs import register_job
+from app.models import DataGeneration
+from app.models import FileHash
+from app.partitions import ensure_partition
+from app.file_processor.base import FileProcessor
+from app.file_processor.file_formats import FileFormatEnum
+from app.file_processor.loader import PointOfInterestLoader
+from app.file_processor.processors import CSVFileProcessor
+from app.file_processor.processors import JSONFileProcessor
+from app.file_processor.processors import XMLFileProcessor
+from app.file_processor.streams import ChunkStream
+
+UPLOAD_PATH = "/imports/"
+BATCH_SIZE = 8192
+
+# Each running import holds a thread, a database connection and a transaction,
+# so uploads beyond this limit are rejected rather than queued.
+_import_slots = threading.BoundedSemaphore(settings.IMPORT_UPLOAD_WORKERS)
+_import_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_UPLOAD_WORKERS, thread_name_prefix="upload-import")
+
+FILE_PROCESSOR_MAP = {
+    FileFormatEnum.CSV.value: CSVFileProcessor(),
+    FileFormatEnum.JSON.value: JSONFileProcessor(),
+    FileFormatEnum.XML.value: XMLFileProcessor(),
+}
+
+
+class FileAlreadyImported(Exception):
+    pass
+
+
+class UploadRouter:
+    """
+    ASGI application that handles `POST /imports/?format=csv|json|xml[&source=...]` uploads
+    itself and passes every other request on to Django.
+
+    Uploads bypass Django's middleware, so they are authenticated here with the
+    `Authorization: Bearer <IMPORT_UPLOAD_TOKEN>` header, and are disabled while
+    no token is configured.
+
+    The request body is streamed chunk by chunk into the file processor running
+    in a background thread, so uploads are never buffered in full or written
+    to disk, and the event loop is only awaited on, never blocked.
+    """
+
+    def __init__(self, application: Callable) -> None:
+        self.application = application
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http" and scope["path"] == UPLOAD_PATH and scope["method"] == "POST":
+            await self._upload(scope, receive, send)
+        else:
+            await self.application(scope, receive, send)
+
+    async def _upload(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if not settings.IMPORT_UPLOAD_TOKEN:
+            await self._respond(send, 403, {"error": "Uploads are disabled"})
+            return
+        headers = dict(scope.get("headers", []))
+        expected = f"Bearer {settings.IMPORT_UPLOAD_TOKEN}".encode()
+        if not hmac.compare_digest(headers.get(b"authorization", b""), expected):
+            await self._respond(send, 401, {"error": "Invalid or missing upload token"})
+            return
+
+        query = parse_qs(scope.get("query_string", b"").decode())
+        file_format = "." + query.get("format", [""])[0].lower().lstrip(".")
+        file_processor = FILE_PROCESSOR_MAP.get(file_format)
+        if file_processor is None:
+            supported_formats = ", ".join(sorted(FILE_PROCESSOR_MAP))
+            await self._respond(send, 400, {"error": f"Unsupported file format. Supported formats {supported_formats}"})
+            return
+
+        source = query.get("source", [""])[0]
+        if source and source not in settings.IMPORT_UPLOAD_SOURCES:
+            # Each new source gets its own partition, so clients can't make up sources
+            await self._respond(send, 400, {"error": f"Unknown source {source}"})
+            return
+
+        if not _import_slots.acquire(blocking=False):
+            await self._respond(send, 503, {"error": "Too many imports in progress, try again later"})
+            return
+
+        job = ImportJob(file_format=file_format)
+        register_job(job)
+        stream = ChunkStream()
+        hasher = hashlib.sha256()
+        _import_executor.submit(
+            _run_import_job_in_worker,
+            job=job,
+            file_processor=file_processor,
+            stream=stream,
+            source=source,
+        )
+
+        try:
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    stream.abort()
+                    job.finish(ImportJob.FAILED, error="Client disconnected during upload")
+                    return
+                chunk = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if chunk:
+                    hasher.update(chunk)
+                    job.bytes_received += len(chunk)
+                    if not stream.try_put(chunk):
+                        await asyncio.to_thread(stream.put, chunk)
+
+            # The hash must be set before the reader sees the end of the data
+            job.file_hash = hasher.hexdigest()
+            await asyncio.to_thread(stream.finish)
+        except BaseException:
+            # Cancelled (e.g. server shutdown) or failed: release the worker waiting for data
+            stream.abort()
+            job.finish(ImportJob.FAILED, error="Upload interrupted")
+            raise
+        await self._respond(send, 202, {**job.to_dict(), "status_url": f"{UPLOAD_PATH}{job.id}/"})
+
+    @staticmethod
+    async def _respond(send: Callable, status: int, body: dict) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+
+def _run_import_job_in_worker(job: ImportJob, file_processor: FileProcessor, stream: ChunkStream, source: str) -> None:
+    try:
+        run_import_job(job=job, file_processor=file_processor, stream=stream, source=source)
+    finally:
+        # Don't hold a connection in an idle worker thread
+        connection.close()
+        _import_slots.release()
+
+
+def run_import_job(job: ImportJob, file_processor: FileProcessor, stream: ChunkStream, source: str = "") -> None:
+    """
+    Imports the streamed rows in a single transaction, rolled back if a file
+    with the same contents turns out to be imported already.
+    """
+    job.status = ImportJob.RUNNING
+
+    def on_batch(inserted: int) -> None:
+        job.rows_processed += inserted
+
+    try:
+        # Creating a partition locks the whole table, so it is committed on its
+        # own rather than held for the length of the upload's transaction
+        ensure_partition(source=source)
+        with transaction.atomic():
+            rows = file_processor.read_stream(stream=io.BufferedReader(stream))
+            loader = PointOfInterestLoader(batch_size=BATCH_SIZE, source=source)
+            total_imported = loader.load(file_processor=file_processor, rows=rows, on_batch=on_batch)
+            if total_imported > 0:
+                if FileHash.objects.filter(file_hash=job.file_hash).exists():
+                    raise FileAlreadyImported()
+                FileHash.objects.create(file_hash=job.file_hash)
+                DataGeneration.increment()
+        job.finish(ImportJob.COMPLETED)
+    except FileAlreadyImported:
+        job.rows_processed = 0
+        job.finish(ImportJob.SKIPPED, error="File already imported")
+    except Exception as e:
+        job.finish(ImportJob.FAILED, error=str(e))
+    finally:
+        stream.abort()
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from app import views
+
+urlpatterns = [
+    path("imports/<str:job_id>/", views.import_job_status, name="import-job-status"),
+    path("pois/", views.pois_by_category, name="pois-by-category"),
+    path("pois/nearest/", views.nearest_pois, name="nearest-pois"),
+    path("pois/bbox/", views.pois_in_bbox, name="pois-in-bbox"),
+    path("pois/cache-stats/", views.query_cache_stats, name="poi-query-cache-stats"),
+]
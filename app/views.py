@@ -1,3 +1,72 @@
-from django.shortcuts import render
+from typing import Callable
 
-# Create your views here.
+from django.http import Http404
+from django.http import HttpRequest
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from app import queries
+from app.cache import poi_query_cache
+from app.jobs import get_job
+
+DEFAULT_LIMIT = 50
+
+
+@require_GET
+def import_job_status(request: HttpRequest, job_id: str) -> JsonResponse:
+    job = get_job(job_id=job_id)
+    if job is None:
+        raise Http404("Import job not found")
+    return JsonResponse(job.to_dict())
+
+
+@require_GET
+def pois_by_category(request: HttpRequest) -> JsonResponse:
+    category = request.GET.get("category")
+    if not category:
+        return JsonResponse({"error": "category is required"}, status=400)
+    return _query_response(
+        lambda: queries.pois_by_category(
+            category=category,
+            limit=request.GET.get("limit", DEFAULT_LIMIT),
+        )
+    )
+
+
+@require_GET
+def nearest_pois(request: HttpRequest) -> JsonResponse:
+    return _query_response(
+        lambda: queries.nearest_pois(
+            latitude=request.GET["latitude"],
+            longitude=request.GET["longitude"],
+            limit=request.GET.get("limit", DEFAULT_LIMIT),
+        )
+    )
+
+
+@require_GET
+def pois_in_bbox(request: HttpRequest) -> JsonResponse:
+    return _query_response(
+        lambda: queries.pois_in_bbox(
+            min_latitude=request.GET["min_latitude"],
+            min_longitude=request.GET["min_longitude"],
+            max_latitude=request.GET["max_latitude"],
+            max_longitude=request.GET["max_longitude"],
+            limit=request.GET.get("limit", DEFAULT_LIMIT),
+        )
+    )
+
+
+@require_GET
+def query_cache_stats(request: HttpRequest) -> JsonResponse:
+    return JsonResponse(poi_query_cache.stats())
+
+
+def _query_response(query: Callable[[], list]) -> JsonResponse:
+    try:
+        results = query()
+    except KeyError as e:
+        return JsonResponse({"error": f"{e.args[0]} is required"}, status=400)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse({"results": results})
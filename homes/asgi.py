@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'homes.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up, as it loads the app models.
+from django.conf import settings  # noqa: E402
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler  # noqa: E402
+
+from app.uploads import UploadRouter  # noqa: E402
+
+if settings.DEBUG:
+    # Serve the admin's static files in development, as runserver does
+    django_application = ASGIStaticFilesHandler(django_application)
+
+application = UploadRouter(django_application)
@@ -89,6 +89,48 @@ DATABASES = {
     }
 }
 
+# Partition the PointOfInterest table by source, so a provider's data can be
+# replaced by swapping partitions. Must be set before running the migrations.
+POI_PARTITIONED = os.environ.get('POI_PARTITIONED', '').lower() in ('1', 'true')
+
+# Shared secret for HTTP uploads (Authorization: Bearer <token>). Uploads are disabled when unset.
+IMPORT_UPLOAD_TOKEN = os.environ.get('IMPORT_UPLOAD_TOKEN', '')
+
+# Sources (providers) that HTTP uploads may tag their records with, comma separated
+IMPORT_UPLOAD_SOURCES = [
+    source.strip() for source in os.environ.get('IMPORT_UPLOAD_SOURCES', '').split(',') if source.strip()
+]
+
+# Maximum number of HTTP uploads imported at the same time
+IMPORT_UPLOAD_WORKERS = int(os.environ.get('IMPORT_UPLOAD_WORKERS', 4))
+
+
+# Caches
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+# Setting POI_CACHE_DIR shares cached POI query results between processes,
+# instead of keeping them in each process's memory.
+if os.environ.get('POI_CACHE_DIR'):
+    CACHES['poi'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('POI_CACHE_DIR'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('POI_CACHE_MAX_ENTRIES', 1024)),
+        },
+    }
+
+POI_QUERY_CACHE = {
+    'MAX_ENTRIES': int(os.environ.get('POI_CACHE_MAX_ENTRIES', 1024)),
+    'TTL': int(os.environ.get('POI_CACHE_TTL', 300)),
+    'ALIAS': 'poi' if 'poi' in CACHES else None,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators